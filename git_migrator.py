@@ -2,159 +2,360 @@ import subprocess
 import argparse
 import os
 import sys
+import shutil
+import stat
+import time
+import threading
+import functools
+import random
+import json
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests  # Add this for GitHub API interactions
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import filedialog
 from tkinter import ttk
 
+# Lines of command output kept for error messages
+ERROR_TAIL_LINES = 200
+
+# Concurrent release creation, with a pause between submissions
+RELEASE_WORKERS = 8
+RELEASE_SUBMIT_INTERVAL = 0.05
+
+# Attempts per GitHub API call when rate limited or on server errors
+API_MAX_ATTEMPTS = 5
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+REPO_DETAILS_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    description
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history {
+            totalCount
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Source-side GitHub GETs are cached briefly so a rerun after a failure is cheap;
+# older entries are revalidated with their ETag
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".git_migrator", "cache")
+CACHE_EXPIRE_AFTER = 300
+
+# One shared session so every GitHub API call reuses pooled TLS connections.
+# The adapter retries only connection and read errors, never on a response
+# status, so rate limits and server errors are retried by _request alone.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=5, backoff_factor=0.5, respect_retry_after_header=False),
+))
+_SESSION.headers.update({
+    "Accept": "application/vnd.github+json",
+    "Accept-Encoding": "gzip",
+    "User-Agent": "git-migrator",
+})
+
 def run_command(command, cwd=None, verbose=False):
-    """Run a shell command and handle errors."""
-    try:
-        if verbose:
-            print(f"Running command: {' '.join(command)}")
-        result = subprocess.run(command, cwd=cwd, check=True, text=True, capture_output=True)
-        if verbose:
-            print(result.stdout)
-    except subprocess.CalledProcessError as e:
-        print(f"Error: {e.stderr}", file=sys.stderr)
+    """Run a shell command, streaming its output, and handle errors."""
+    if verbose:
+        print(f"Running command: {' '.join(command)}")
+    # Read a single pipe so nothing can deadlock: stdout and stderr merged when
+    # verbose, otherwise stdout is discarded and only stderr is kept for errors
+    process = subprocess.Popen(command, cwd=cwd,
+                               stdout=subprocess.PIPE if verbose else subprocess.DEVNULL,
+                               stderr=subprocess.STDOUT if verbose else subprocess.PIPE)
+    output = process.stdout if verbose else process.stderr
+    # Only the tail of the output is kept, and decoded only to be shown
+    tail = deque(maxlen=ERROR_TAIL_LINES)
+    with output:
+        for line in output:
+            if verbose:
+                print(line.decode("utf-8", errors="replace"), end="", flush=True)
+            tail.append(line)
+    if process.wait() != 0:
+        print(f"Error: {b''.join(tail).decode('utf-8', errors='replace')}", file=sys.stderr)
         sys.exit(1)
 
-def clone_repo(source_url, temp_dir, verbose=False):
-    """Clone the source repository."""
-    print(f"Cloning repository from {source_url}...")
-    run_command(["git", "clone", "--mirror", source_url, temp_dir], verbose=verbose)
+def _chmod_and_retry(func, path, exc):
+    """Make a read-only file (e.g. under .git/objects) writable and retry removing it."""
+    os.chmod(path, stat.S_IWRITE | stat.S_IREAD | stat.S_IEXEC)
+    func(path)
 
-def fetch_tags(temp_dir, verbose=False):
-    """Fetch all tags from the source repository."""
-    print("Fetching all tags...")
-    run_command(["git", "fetch", "--tags"], cwd=temp_dir, verbose=verbose)
+def remove_dir(path):
+    """Remove a directory tree, including read-only git object files."""
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_chmod_and_retry)
+    else:
+        shutil.rmtree(path, onerror=_chmod_and_retry)
 
-def add_target_remote(temp_dir, target_url, verbose=False):
-    """Add target remote if it doesn't exist."""
-    try:
-        result = subprocess.run(["git", "remote"], cwd=temp_dir, capture_output=True, text=True)
-        if "target" not in result.stdout.split():
-            run_command(["git", "remote", "add", "target", target_url], cwd=temp_dir, verbose=verbose)
-    except Exception as e:
-        if verbose:
-            print(f"Error checking remotes: {str(e)}")
-        # If checking remotes fails, try adding it anyway but ignore if it exists
-        try:
-            run_command(["git", "remote", "add", "target", target_url], cwd=temp_dir, verbose=verbose)
-        except subprocess.CalledProcessError as e:
-            if "already exists" not in str(e.stderr):
-                raise
+def _git_config_args(pack_threads=None):
+    """Return `git -c` options overriding git's own settings, if any were given."""
+    # Without an override git picks its pack thread count from the CPU count
+    return ["-c", f"pack.threads={pack_threads}"] if pack_threads is not None else []
 
-def push_repo(temp_dir, target_url, verbose=False):
+def clone_repo(source_url, temp_dir, verbose=False, pack_threads=None,
+               refs_only=False):
+    """Clone the source repository, without file contents if refs_only is set."""
+    print(f"Cloning repository from {source_url}...")
+    # A blob-less partial clone only has commits, trees and tags; git marks the
+    # origin as a promisor so missing blobs could still be fetched on demand
+    partial = ["--filter=blob:none"] if refs_only else []
+    run_command(["git", *_git_config_args(pack_threads), "clone", "--mirror", *partial, source_url, temp_dir],
+                verbose=verbose)
+
+def push_repo(temp_dir, target_url, verbose=False, pack_threads=None):
     """Push the repository to the target remote."""
     print(f"Pushing repository to {target_url}...")
-    add_target_remote(temp_dir, target_url, verbose)
-    # Push all branches and tags, excluding hidden references
-    run_command(["git", "push", "--all", "target"], cwd=temp_dir, verbose=verbose)
-    run_command(["git", "push", "--tags", "target"], cwd=temp_dir, verbose=verbose)
+    # Push straight to the URL; a named remote would cost extra git processes.
+    # Push all branches and tags in one atomic push, excluding hidden references:
+    # --mirror would also push GitHub's read-only refs/pull/* and delete target refs
+    run_command(["git", *_git_config_args(pack_threads), "push", "--atomic", target_url,
+                 "refs/heads/*:refs/heads/*", "refs/tags/*:refs/tags/*"], cwd=temp_dir, verbose=verbose)
 
-def push_tags(temp_dir, target_url, verbose=False):
+def push_tags(temp_dir, target_url, verbose=False, pack_threads=None):
     """Push all tags to the target repository."""
     print("Pushing all tags to the target repository...")
-    add_target_remote(temp_dir, target_url, verbose)
-    run_command(["git", "push", "--tags", "target"], cwd=temp_dir, verbose=verbose)
-
-def migrate_github_releases(source_url, target_url, token, verbose=False):
-    """Migrate GitHub releases from the source to the target repository."""
+    run_command(["git", *_git_config_args(pack_threads), "push", "--tags", target_url], cwd=temp_dir, verbose=verbose)
+
+def _rate_limit_delay(response):
+    """Return how long GitHub asks us to wait, or None if this is not a rate limit."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        return float(retry_after)
+    reset = response.headers.get("X-RateLimit-Reset")
+    if response.headers.get("X-RateLimit-Remaining") == "0" and reset:
+        return max(0.0, float(reset) - time.time()) + 1
+    return None
+
+def _request(method, url, idempotent=None, **kwargs):
+    """Send a GitHub API request, retrying rate limits and server errors."""
+    # Rate-limited requests were never processed, so any method may retry them.
+    # GitHub can return a 5xx after applying a write, so only idempotent
+    # requests (GETs unless told otherwise) are retried on server errors.
+    if idempotent is None:
+        idempotent = method == "GET"
+    for attempt in range(API_MAX_ATTEMPTS):
+        response = _SESSION.request(method, url, **kwargs)
+        if response.status_code in (403, 429):
+            delay = _rate_limit_delay(response)
+            if delay is None:
+                if response.status_code == 403:
+                    # A plain 403 is a permission error, not worth retrying
+                    return response
+                delay = 2 ** attempt + random.random()
+        elif response.status_code >= 500 and idempotent:
+            delay = 2 ** attempt + random.random()
+        else:
+            return response
+        if attempt == API_MAX_ATTEMPTS - 1:
+            break
+        print(f"GitHub API returned {response.status_code}, retrying in {delay:.0f}s...", file=sys.stderr)
+        time.sleep(delay)
+    return response
+
+def _cache_path(url, headers, params):
+    """Return the cache file for a GET, keyed by URL, query and credentials."""
+    key = json.dumps([url, params, headers.get("Authorization")], sort_keys=True)
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+def _write_cache(path, entry):
+    """Atomically store a cache entry; a missing or unwritable cache only costs a refetch."""
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump(entry, f)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+def _get_json(url, headers, params=None, cache=False):
+    """GET a GitHub API URL and return its JSON body and the next page URL."""
+    path = _cache_path(url, headers, params) if cache else None
+    entry = None
+    if path:
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            if time.time() - entry["fetched_at"] < CACHE_EXPIRE_AFTER:
+                return entry["body"], entry["next"]
+        except (OSError, ValueError, KeyError):
+            entry = None
+
+    # Revalidate a stale entry; a 304 reply does not count against the rate limit
+    if entry and entry.get("etag"):
+        headers = dict(headers, **{"If-None-Match": entry["etag"]})
+    response = _request("GET", url, headers=headers, params=params)
+    if response.status_code == 304 and entry:
+        entry["fetched_at"] = time.time()
+        _write_cache(path, entry)
+        return entry["body"], entry["next"]
+    if response.status_code != 200:
+        print(f"Failed to fetch {url}: {response.text}", file=sys.stderr)
+        sys.exit(1)
+    body = response.json()
+    next_url = response.links.get("next", {}).get("url")
+
+    if path:
+        _write_cache(path, {
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "body": body,
+            "next": next_url,
+        })
+    return body, next_url
+
+def _paginate(url, headers, per_page=80, cache=False):
+    """Yield every item of a paginated GitHub API list, following Link headers."""
+    params = {"per_page": per_page}
+    while url:
+        items, url = _get_json(url, headers, params=params, cache=cache)
+        yield from items
+        # The "next" link already carries the query string
+        params = None
+
+@functools.lru_cache(maxsize=32)
+def _extract_owner_repo(url):
+    """Return the (owner, repo) pair from a GitHub repository URL."""
+    rest, _, repo = url.rstrip("/").rpartition("/")
+    return rest.rpartition("/")[2], repo
+
+def migrate_github_releases(source, target, token, verbose=False):
+    """Migrate GitHub releases from the source to the target (owner, repo)."""
     print("Migrating GitHub releases...")
     headers = {"Authorization": f"token {token}"}
-    
-    # Extract owner and repo names from URLs
-    def extract_owner_repo(url):
-        parts = url.rstrip("/").split("/")
-        return parts[-2], parts[-1]
 
-    source_owner, source_repo = extract_owner_repo(source_url)
-    target_owner, target_repo = extract_owner_repo(target_url)
+    source_owner, source_repo = source
+    target_owner, target_repo = target
 
     # Fetch releases from the source repository
     source_releases_url = f"https://api.github.com/repos/{source_owner}/{source_repo}/releases"
-    response = requests.get(source_releases_url, headers=headers)
-    if response.status_code != 200:
-        print(f"Failed to fetch releases from {source_url}: {response.text}", file=sys.stderr)
-        sys.exit(1)
-
-    releases = response.json()
+    releases = list(_paginate(source_releases_url, headers, cache=True))
     if verbose:
         print(f"Found {len(releases)} releases in the source repository.")
 
-    # Create releases in the target repository
+    # Releases are created concurrently, so creation order can't decide which one
+    # GitHub marks as latest; carry the source's choice over explicitly
+    response = _request("GET", f"{source_releases_url}/latest", headers=headers)
+    if response.status_code == 200:
+        latest_tag = response.json()["tag_name"]
+    elif response.status_code == 404:
+        # The source has no published, non-prerelease release
+        latest_tag = None
+    else:
+        print(f"Failed to fetch the latest release from {source_owner}/{source_repo}: {response.text}", file=sys.stderr)
+        sys.exit(1)
+
+    # Skip releases the target already has, e.g. from an earlier partial run;
+    # this list changes as we migrate, so it is never cached
     target_releases_url = f"https://api.github.com/repos/{target_owner}/{target_repo}/releases"
-    for release in releases:
-        release_data = {
+    existing = {release["tag_name"] for release in _paginate(target_releases_url, headers)}
+    skipped = sum(release["tag_name"] in existing for release in releases)
+    if verbose and skipped:
+        print(f"Skipping {skipped} releases that already exist in the target repository.")
+
+    # Create releases in the target repository
+    releases_data = [
+        {
             "tag_name": release["tag_name"],
             "name": release["name"],
             "body": release["body"],
             "draft": release["draft"],
-            "prerelease": release["prerelease"]
+            "prerelease": release["prerelease"],
+            "make_latest": "true" if release["tag_name"] == latest_tag else "false"
         }
+        for release in releases
+        if release["tag_name"] not in existing
+    ]
+
+    # Set by the first failed POST so the remaining releases are not sent
+    failed = threading.Event()
+
+    def create_release(release_data):
+        if failed.is_set():
+            return None
         if verbose:
-            print(f"Migrating release: {release['name']} (tag: {release['tag_name']})")
-        response = requests.post(target_releases_url, headers=headers, json=release_data)
+            print(f"Migrating release: {release_data['name']} (tag: {release_data['tag_name']})")
+        response = _request("POST", target_releases_url, headers=headers, json=release_data)
         if response.status_code not in [200, 201]:
-            print(f"Failed to create release in {target_url}: {response.text}", file=sys.stderr)
+            failed.set()
+        return response
+
+    # Releases are independent, so POST them concurrently
+    with ThreadPoolExecutor(max_workers=RELEASE_WORKERS) as executor:
+        futures = []
+        for release_data in releases_data:
+            if failed.is_set():
+                break
+            futures.append(executor.submit(create_release, release_data))
+            # Space out submissions to stay clear of GitHub's secondary rate limits
+            time.sleep(RELEASE_SUBMIT_INTERVAL)
+
+    for future in futures:
+        response = future.result()
+        if response is not None and response.status_code not in [200, 201]:
+            print(f"Failed to create release in {target_owner}/{target_repo}: {response.text}", file=sys.stderr)
             sys.exit(1)
 
-def fetch_repo_details(source_url, token, verbose=False):
-    """Fetch repository description and all commits."""
-    print("Fetching repository details...")
+def _fetch_via_graphql(owner, repo, token):
+    """Fetch the description and commit count of a repository in one GraphQL query."""
     headers = {"Authorization": f"token {token}"}
-
-    # Extract owner and repo names from URL
-    def extract_owner_repo(url):
-        parts = url.rstrip("/").split("/")
-        return parts[-2], parts[-1]
-
-    source_owner, source_repo = extract_owner_repo(source_url)
-
-    # Fetch repository details
-    repo_url = f"https://api.github.com/repos/{source_owner}/{source_repo}"
-    response = requests.get(repo_url, headers=headers)
+    query = {"query": REPO_DETAILS_QUERY, "variables": {"owner": owner, "name": repo}}
+    # The query only reads, so it is safe to retry like a GET
+    response = _request("POST", GRAPHQL_URL, idempotent=True, headers=headers, json=query)
     if response.status_code != 200:
         print(f"Failed to fetch repository details: {response.text}", file=sys.stderr)
         sys.exit(1)
 
-    repo_details = response.json()
-    description = repo_details.get("description", "No description provided")
+    # GraphQL reports errors such as an unknown repository with a 200 status
+    result = response.json()
+    repository = (result.get("data") or {}).get("repository")
+    if result.get("errors") or not repository:
+        print(f"Failed to fetch repository details: {result.get('errors')}", file=sys.stderr)
+        sys.exit(1)
+    return repository
+
+def fetch_repo_details(source, token, verbose=False):
+    """Fetch the source (owner, repo) description and commit count."""
+    print("Fetching repository details...")
+    source_owner, source_repo = source
+
+    repository = _fetch_via_graphql(source_owner, source_repo, token)
+    description = repository.get("description", "No description provided")
     if verbose:
         print(f"Repository description: {description}")
 
-    # Fetch all commits
-    commits_url = f"https://api.github.com/repos/{source_owner}/{source_repo}/commits"
-    response = requests.get(commits_url, headers=headers)
-    if response.status_code != 200:
-        print(f"Failed to fetch commits: {response.text}", file=sys.stderr)
-        sys.exit(1)
-
-    commits = response.json()
+    # An empty repository has no default branch
+    branch = repository.get("defaultBranchRef")
+    commit_count = branch["target"]["history"]["totalCount"] if branch else 0
     if verbose:
-        print(f"Found {len(commits)} commits in the repository.")
-        for commit in commits:
-            print(f"Commit: {commit['sha']} - {commit['commit']['message']}")
+        print(f"Found {commit_count} commits in the repository.")
 
-    return description, commits
+    return description, commit_count
 
-def update_repo_description(target_url, token, description, verbose=False):
-    """Update the target repository's description."""
+def update_repo_description(target, token, description, verbose=False):
+    """Update the target (owner, repo) description."""
     print("Updating target repository description...")
     headers = {"Authorization": f"token {token}"}
 
-    # Extract owner and repo names from URL
-    def extract_owner_repo(url):
-        parts = url.rstrip("/").split("/")
-        return parts[-2], parts[-1]
-
-    target_owner, target_repo = extract_owner_repo(target_url)
+    target_owner, target_repo = target
 
     # Update repository details
     repo_url = f"https://api.github.com/repos/{target_owner}/{target_repo}"
-    response = requests.patch(repo_url, headers=headers, json={"description": description})
+    response = _request("PATCH", repo_url, headers=headers, json={"description": description})
     if response.status_code not in [200, 201]:
         print(f"Failed to update repository description: {response.text}", file=sys.stderr)
         sys.exit(1)
@@ -172,13 +373,13 @@ def run_gui():
 Only public repository commits and tags can be migrated without a token."""
         messagebox.showwarning("Token Not Provided", warning_message)
 
-    def check_token_required_features():
+    def check_token_required_features(token, migrate_description, migrate_releases):
         """Check if any selected features require a token"""
-        if not token_entry.get():
+        if not token:
             required_features = []
-            if migrate_description_var.get():
+            if migrate_description:
                 required_features.append("Repository Description Migration")
-            if migrate_releases_var.get():
+            if migrate_releases:
                 required_features.append("GitHub Releases Migration")
             
             if required_features:
@@ -187,13 +388,15 @@ Only public repository commits and tags can be migrated without a token."""
                 return False
         return True
 
+    # The migration runs in a worker thread; Tk may only be touched from the main one
     def set_status(msg):
-        status_var.set(msg)
-        root.update_idletasks()
+        root.after(0, status_var.set, msg)
 
     def set_progress(val):
-        progress_var.set(val)
-        root.update_idletasks()
+        root.after(0, progress_var.set, val)
+
+    def show_message(show, title, message):
+        root.after(0, show, title, message)
 
     def show_tooltip(widget, text):
         def on_enter(event):
@@ -215,111 +418,121 @@ Only public repository commits and tags can be migrated without a token."""
         target_url = target_entry.get()
         token = token_entry.get()
         temp_dir = temp_dir_entry.get()
-        verbose = verbose_var.get()
-        migrate_releases = migrate_releases_var.get()
-        migrate_description = migrate_description_var.get()
-        migrate_commits = migrate_commits_var.get()
-        migrate_tags = migrate_tags_var.get()
+        verbose = bool(verbose_var.get())
+        migrate_releases = bool(migrate_releases_var.get())
+        migrate_description = bool(migrate_description_var.get())
+        migrate_commits = bool(migrate_commits_var.get())
+        migrate_tags = bool(migrate_tags_var.get())
 
         if not source_url or not target_url:
             messagebox.showerror("Error", "Source URL and Target URL are required.")
             return
+        source = _extract_owner_repo(source_url)
+        target = _extract_owner_repo(target_url)
 
-        if not check_token_required_features():
+        if not check_token_required_features(token, migrate_description, migrate_releases):
             return
 
         if not token:
             show_token_warning()
 
+        step = 0
+        total_steps = sum([migrate_description, migrate_commits, migrate_tags, migrate_releases]) + 2
+
+        def advance():
+            nonlocal step
+            step += 1
+            set_progress(100 * step // total_steps)
+
+        if not temp_dir:
+            temp_dir = os.path.join(os.getcwd(), "temp_repo")
+
         set_progress(0)
         set_status("Starting migration...")
 
-        try:
-            if not temp_dir:
-                temp_dir = os.path.join(os.getcwd(), "temp_repo")
-
-            # Clean up existing temp directory if it exists
-            if os.path.exists(temp_dir):
-                if verbose:
-                    print(f"Cleaning up existing temporary directory: {temp_dir}")
-                run_command(["rm", "-rf", temp_dir], verbose=verbose)
-
-            step = 0
-            total_steps = sum([migrate_description, migrate_commits, migrate_tags, migrate_releases]) + 2
-
-            # Execute migration based on user selection
-            if (migrate_description or migrate_commits) and token:
-                try:
-                    set_status("Fetching repository details...")
-                    description, commits = fetch_repo_details(source_url, token, verbose=verbose)
-                    step += 1
-                    set_progress(int(100 * step / total_steps))
-                    if migrate_description:
-                        set_status("Updating target repository description...")
-                        update_repo_description(target_url, token, description, verbose=verbose)
-                        step += 1
-                        set_progress(int(100 * step / total_steps))
-                    if migrate_commits:
-                        set_status("Fetched commits info.")
-                        step += 1
-                        set_progress(int(100 * step / total_steps))
-                except Exception as e:
-                    messagebox.showwarning("API Error", f"Failed to fetch repository details: {str(e)}\nContinuing with other operations...")
-
-            if migrate_tags or migrate_commits:
-                try:
-                    set_status("Cloning repository...")
-                    clone_repo(source_url, temp_dir, verbose=verbose)
-                    step += 1
-                    set_progress(int(100 * step / total_steps))
-                    
-                    if migrate_tags:
-                        set_status("Fetching and pushing tags...")
-                        fetch_tags(temp_dir, verbose=verbose)
-                        push_tags(temp_dir, target_url, verbose=verbose)
-                        step += 1
-                        set_progress(int(100 * step / total_steps))
-
-                    if migrate_commits:
-                        set_status("Pushing repository branches...")
-                        push_repo(temp_dir, target_url, verbose=verbose)
-                        step += 1
-                        set_progress(int(100 * step / total_steps))
-
-                except Exception as e:
-                    messagebox.showerror("Git Error", f"Failed during git operations: {str(e)}")
-                    set_status("Error during git operations.")
-                    set_progress(0)
-                    return
-
-            if migrate_releases and token:
-                try:
-                    set_status("Migrating GitHub releases...")
-                    migrate_github_releases(source_url, target_url, token, verbose=verbose)
-                    step += 1
-                    set_progress(int(100 * step / total_steps))
-                except Exception as e:
-                    messagebox.showwarning("API Error", f"Failed to migrate releases: {str(e)}")
-
-            set_progress(100)
-            set_status("Migration completed successfully!")
-            messagebox.showinfo("Success", "Migration completed successfully!")
-
-        except Exception as e:
-            set_status("Error during migration.")
-            set_progress(0)
-            messagebox.showerror("Error", str(e))
-        finally:
-            # Clean up temp directory
-            if os.path.exists(temp_dir):
-                try:
+        def run_migration():
+            try:
+                # Clean up existing temp directory if it exists
+                if os.path.exists(temp_dir):
                     if verbose:
-                        print(f"Cleaning up temporary directory: {temp_dir}")
-                    run_command(["rm", "-rf", temp_dir], verbose=verbose)
-                except Exception as e:
-                    messagebox.showwarning("Warning", f"Failed to clean up temporary directory: {str(e)}")
-            set_status("")
-            set_progress(0)
+                        print(f"Cleaning up existing temporary directory: {temp_dir}")
+                    remove_dir(temp_dir)
+
+                # Execute migration based on user selection
+                if (migrate_description or migrate_commits) and token:
+                    try:
+                        set_status("Fetching repository details...")
+                        description, commit_count = fetch_repo_details(source, token, verbose=verbose)
+                        advance()
+                        if migrate_description:
+                            set_status("Updating target repository description...")
+                            update_repo_description(target, token, description, verbose=verbose)
+                            advance()
+                        if migrate_commits:
+                            set_status("Fetched commits info.")
+                            advance()
+                    except Exception as e:
+                        show_message(messagebox.showwarning, "API Error", f"Failed to fetch repository details: {str(e)}\nContinuing with other operations...")
+
+                if migrate_tags or migrate_commits:
+                    try:
+                        set_status("Cloning repository...")
+                        clone_repo(source_url, temp_dir, verbose=verbose)
+                        advance()
+                        
+                        if migrate_tags:
+                            set_status("Pushing tags...")
+                            push_tags(temp_dir, target_url, verbose=verbose)
+                            advance()
+
+                        if migrate_commits:
+                            set_status("Pushing repository branches...")
+                            push_repo(temp_dir, target_url, verbose=verbose)
+                            advance()
+
+                    except Exception as e:
+                        show_message(messagebox.showerror, "Git Error", f"Failed during git operations: {str(e)}")
+                        set_status("Error during git operations.")
+                        set_progress(0)
+                        return
+
+                if migrate_releases and token:
+                    try:
+                        set_status("Migrating GitHub releases...")
+                        migrate_github_releases(source, target, token, verbose=verbose)
+                        advance()
+                    except Exception as e:
+                        show_message(messagebox.showwarning, "API Error", f"Failed to migrate releases: {str(e)}")
+
+                set_progress(100)
+                set_status("Migration completed successfully!")
+                show_message(messagebox.showinfo, "Success", "Migration completed successfully!")
+
+            except Exception as e:
+                set_status("Error during migration.")
+                set_progress(0)
+                show_message(messagebox.showerror, "Error", str(e))
+            except SystemExit:
+                # Failing git and API helpers exit after printing the error to the console
+                set_status("Error during migration.")
+                set_progress(0)
+                show_message(messagebox.showerror, "Error", "Migration failed, see the console output for details.")
+            finally:
+                # Clean up temp directory
+                if os.path.exists(temp_dir):
+                    try:
+                        if verbose:
+                            print(f"Cleaning up temporary directory: {temp_dir}")
+                        remove_dir(temp_dir)
+                    except Exception as e:
+                        show_message(messagebox.showwarning, "Warning", f"Failed to clean up temporary directory: {str(e)}")
+                set_status("")
+                set_progress(0)
+                root.after(0, lambda: start_button.config(state=tk.NORMAL))
+
+        # Run the migration off the Tk thread so the window keeps repainting
+        start_button.config(state=tk.DISABLED)
+        threading.Thread(target=run_migration, daemon=True).start()
 
     def browse_temp_dir():
         directory = filedialog.askdirectory()
@@ -384,7 +597,8 @@ Only public repository commits and tags can be migrated without a token."""
     tk.Checkbutton(root, text="Migrate Tags", variable=migrate_tags_var).grid(row=9, column=1, sticky=tk.W, padx=5, pady=5)
 
     # Start Button
-    tk.Button(root, text="Start Migration", command=start_migration).grid(row=10, column=1, pady=10)
+    start_button = tk.Button(root, text="Start Migration", command=start_migration)
+    start_button.grid(row=10, column=1, pady=10)
 
     # Add progress bar and status label
     progress_var = tk.IntVar()
@@ -415,8 +629,10 @@ def main():
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
     parser.add_argument("--token", help="GitHub personal access token for private repositories or releases migration")
     parser.add_argument("--migrate-releases", action="store_true", help="Migrate GitHub releases (requires --token)")
-    parser.add_argument("--fetch-details", action="store_true", help="Fetch repository description and commits")
+    parser.add_argument("--fetch-details", action="store_true", help="Fetch repository description and commit count")
     parser.add_argument("--all", action="store_true", help="Perform all actions in sequence")
+    parser.add_argument("--refs-only", action="store_true", help="Clone without file contents and push only tags (the target must already have the tagged commits)")
+    parser.add_argument("--pack-threads", type=int, help="Override the number of threads git uses to compress packs (default: git's own setting)")
     args, unknown = parser.parse_known_args()
 
     if args.gui:
@@ -429,6 +645,10 @@ def main():
     verbose = args.verbose
     token = args.token
     migrate_releases = args.migrate_releases
+    source = _extract_owner_repo(source_url)
+    target = _extract_owner_repo(target_url)
+    pack_threads = args.pack_threads
+    refs_only = args.refs_only
 
     if args.dry_run:
         print("Dry run mode enabled. No changes will be made.")
@@ -449,40 +669,50 @@ Only public repository commits and tags can be migrated without a token.
 
     if args.all:
         print("Executing all actions in sequence...")
-        # Fetch repository details and commits
+
+        # Fetch repository details first: a bad token fails here, before any clone
         if token:
-            description, commits = fetch_repo_details(source_url, token, verbose=verbose)
+            description, commit_count = fetch_repo_details(source, token, verbose=verbose)
             print(f"Repository Description: {description}")
-            print(f"Total Commits: {len(commits)}")
-
-            # Update target repository description
-            update_repo_description(target_url, token, description, verbose=verbose)
+            print(f"Total Commits: {commit_count}")
         else:
-            print("Skipping fetching repository details and commits (requires --token).")
+            print("Skipping fetching repository description and commit count (requires --token).")
 
         # Clone and push the repository
         if os.path.exists(temp_dir):
             print(f"Cleaning up existing temporary directory: {temp_dir}")
-            run_command(["rm", "-rf", temp_dir], verbose=verbose)
+            remove_dir(temp_dir)
 
         try:
-            clone_repo(source_url, temp_dir, verbose=verbose)
-            fetch_tags(temp_dir, verbose=verbose)
-            push_repo(temp_dir, target_url, verbose=verbose)
-            push_tags(temp_dir, target_url, verbose=verbose)
-
-            # Migrate GitHub releases
+            # The description update only goes through the GitHub API, so run
+            # it in a worker thread while git clones the repository
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                update_future = executor.submit(
+                    update_repo_description, target, token, description, verbose=verbose) if token else None
+                clone_repo(source_url, temp_dir, verbose=verbose, pack_threads=pack_threads,
+                           refs_only=refs_only)
+                # Don't push anything if the description update has already failed
+                if update_future and update_future.done():
+                    update_future.result()
+                if refs_only:
+                    push_tags(temp_dir, target_url, verbose=verbose, pack_threads=pack_threads)
+                else:
+                    push_repo(temp_dir, target_url, verbose=verbose, pack_threads=pack_threads)
+                if update_future:
+                    update_future.result()
+
+            # Migrate GitHub releases once their tags exist on the target
             if migrate_releases:
                 if not token:
                     print("Error: --migrate-releases requires --token", file=sys.stderr)
                     sys.exit(1)
-                migrate_github_releases(source_url, target_url, token, verbose=verbose)
+                migrate_github_releases(source, target, token, verbose=verbose)
 
             print("All actions completed successfully!")
         finally:
             if os.path.exists(temp_dir):
                 print(f"Cleaning up temporary directory: {temp_dir}")
-                run_command(["rm", "-rf", temp_dir], verbose=verbose)
+                remove_dir(temp_dir)
         sys.exit(0)
 
     # Individual actions
@@ -490,34 +720,36 @@ Only public repository commits and tags can be migrated without a token.
         if not token:
             print("Error: --fetch-details requires --token", file=sys.stderr)
             sys.exit(1)
-        description, commits = fetch_repo_details(source_url, token, verbose=verbose)
+        description, commit_count = fetch_repo_details(source, token, verbose=verbose)
         print(f"Repository Description: {description}")
-        print(f"Total Commits: {len(commits)}")
+        print(f"Total Commits: {commit_count}")
         sys.exit(0)
 
     if os.path.exists(temp_dir):
         print(f"Cleaning up existing temporary directory: {temp_dir}")
-        run_command(["rm", "-rf", temp_dir], verbose=verbose)
+        remove_dir(temp_dir)
 
     try:
         # Clone and push the repository.        
-        clone_repo(source_url, temp_dir, verbose=verbose)
-        fetch_tags(temp_dir, verbose=verbose)
-        push_repo(temp_dir, target_url, verbose=verbose)
-        push_tags(temp_dir, target_url, verbose=verbose)
+        clone_repo(source_url, temp_dir, verbose=verbose, pack_threads=pack_threads,
+                   refs_only=refs_only)
+        if refs_only:
+            push_tags(temp_dir, target_url, verbose=verbose, pack_threads=pack_threads)
+        else:
+            push_repo(temp_dir, target_url, verbose=verbose, pack_threads=pack_threads)
 
         # Migrate GitHub releases if requested
         if migrate_releases:
             if not token:
                 print("Error: --migrate-releases requires --token", file=sys.stderr)
                 sys.exit(1)
-            migrate_github_releases(source_url, target_url, token, verbose=verbose)
+            migrate_github_releases(source, target, token, verbose=verbose)
 
         print("Migration completed successfully!")
     finally:
         if os.path.exists(temp_dir):
             print(f"Cleaning up temporary directory: {temp_dir}")
-            run_command(["rm", "-rf", temp_dir], verbose=verbose)
+            remove_dir(temp_dir)
 
 if __name__ == "__main__":
     if len(sys.argv) == 1 or (len(sys.argv) > 1 and sys.argv[1] == "--gui"):